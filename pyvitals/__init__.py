@@ -1,6 +1,34 @@
-from .async_main import (async_download_level, async_download_unzip, async_get_filename_from_url,
-                         async_get_setlists_url, async_get_sheet_data, async_parse_url)
+from ._shared import clear_cache
+from .async_main import (async_download_level, async_download_levels, async_download_unzip,
+                         async_get_filename_from_url, async_get_setlists_url, async_get_sheet_data, async_make_client,
+                         async_parse_url, async_parse_urls)
 from .exceptions import BadRDZipFile, BadURLFilename, BaseError, No2PLevel
-from .main import (download_level, download_unzip, get_filename, get_filename_from_url, get_setlists_url,
-                   get_sheet_data, parse_level, parse_rdzip, parse_url, rename, unzip_level)
-from .classes import Difficulty, PartialSettings, LevelSettings, SiteMetadata
+from .main import (download_level, download_levels, download_unzip, get_filename, get_filename_from_url,
+                   get_setlists_url, get_sheet_data, make_client, parse_level, parse_levels, parse_rdzip,
+                   parse_rdzip_all, parse_rdzips, parse_url, parse_urls, rename, unzip_level)
+
+_CLASSES = {'Difficulty', 'PartialSettings', 'LevelSettings', 'SiteMetadata'}
+
+__all__ = [
+    'async_download_level', 'async_download_levels', 'async_download_unzip', 'async_get_filename_from_url',
+    'async_get_setlists_url', 'async_get_sheet_data', 'async_make_client', 'async_parse_url', 'async_parse_urls',
+    'BadRDZipFile', 'BadURLFilename', 'BaseError', 'No2PLevel',
+    'clear_cache', 'download_level', 'download_levels', 'download_unzip', 'get_filename', 'get_filename_from_url',
+    'get_setlists_url', 'get_sheet_data', 'make_client', 'parse_level', 'parse_levels', 'parse_rdzip',
+    'parse_rdzip_all', 'parse_rdzips', 'parse_url', 'parse_urls', 'rename', 'unzip_level',
+    *sorted(_CLASSES),
+]
+
+
+def __getattr__(name: str):
+    # The models pull in pydantic, which is slow to import, so only load them once they're asked for
+    if name in _CLASSES:
+        from . import classes
+        return getattr(classes, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    # Include the models, even though they aren't loaded until they're first used
+    return sorted({*globals(), *_CLASSES})
@@ -0,0 +1,84 @@
+"""Endpoints, the response cache, and filename helpers used by both main and async_main."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+from weakref import WeakKeyDictionary
+
+import httpx
+
+# Endpoints for the level sheet and the setlists
+SHEET_URL = 'https://script.google.com/macros/s/AKfycbzm3I9ENulE7uOmze53cyDuj7Igi7fmGiQ6w045fCRxs_sK3D4/exec'
+SETLISTS_URL = 'https://script.google.com/macros/s/AKfycbzKbt6JDlvFs0jgR2AqGrjqb6UxnoXjVFmoU4QnEHbCc28Tx7rGMUG-lEm5NklqgBtX/exec'  # noqa:E501
+
+# How long responses from the sheet and setlists endpoints are reused for, in seconds
+CACHE_TTL = 5 * 60
+
+# Raw response bodies from the sheet and setlists endpoints along with when they expire, kept separately for each
+# client, since clients can be set up differently (proxies, auth, ...), and then keyed by request url
+_response_cache: WeakKeyDictionary[Any, dict[str, tuple[float, bytes]]] = WeakKeyDictionary()
+
+# Translation table that deletes the characters that windows doesn't like in filenames
+BAD_FILENAME_CHARS_TABLE = str.maketrans('', '', r'<>:"/\|?*')
+
+
+def get_cached(client: Union[httpx.Client, httpx.AsyncClient], key: str) -> Optional[bytes]:
+    cached = _response_cache.get(client, {}).get(key)
+    if cached is None or cached[0] < time.monotonic():
+        return None
+
+    return cached[1]
+
+
+def set_cached(client: Union[httpx.Client, httpx.AsyncClient], key: str, content: bytes) -> None:
+    _response_cache.setdefault(client, {})[key] = (time.monotonic() + CACHE_TTL, content)
+
+
+def clear_cache() -> None:
+    """
+    Forgets the cached sheet and setlists data, so that the next call to get_sheet_data() or get_setlists_url()
+    (or their async versions) fetches fresh data. Otherwise, their responses are reused for 5 minutes.
+    To skip the cache for a single call, pass use_cache=False to it instead.
+    """
+
+    _response_cache.clear()
+
+
+def rdzip_url_filename(url: str) -> str:
+    # The last segment of a url ending in .rdzip is the filename, minus the characters windows doesn't like
+    return url.rsplit('/', 1)[-1].translate(BAD_FILENAME_CHARS_TABLE)
+
+
+def rename(path: Path) -> Path:
+    """
+    Given some path, returns a file path that doesn't already exist.
+    This is used to ensure that unique file names are always used.
+    """
+
+    if not path.exists():
+        return path
+
+    # List the folder once instead of checking whether every candidate exists one by one,
+    # the final exists() check is only there for case-insensitive filesystems.
+    existing = {entry.name for entry in os.scandir(path.parent)}
+
+    index = 2
+    while (candidate := path.with_stem(path.stem + f" ({index})")).name in existing or candidate.exists():
+        index += 1
+
+    return candidate
+
+
+def claim_unique_path(path: Path) -> Path:
+    # Create the file right away so that other downloads, on other threads or tasks, can't end up picking the same name
+    while True:
+        candidate = rename(path)
+        try:
+            candidate.touch(exist_ok=False)
+            return candidate
+        except FileExistsError:
+            # Another thread took this name first, so look again from the original name
+            continue
@@ -1,36 +1,76 @@
 from __future__ import annotations
 
+import asyncio
+from io import BytesIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Awaitable, Iterable, Optional
 
+import aiofiles
 import httpx
+import orjson
 
-from .classes import Level, SiteMetadata
-from .main import get_filename, parse_rdzip, rename, trim_list, unzip_level
+from ._shared import SETLISTS_URL, SHEET_URL, claim_unique_path, get_cached, rdzip_url_filename, rename, set_cached
+from .exceptions import BadURLFilename
+from .main import CHUNK_SIZE, get_filename, parse_rdzip, trim_list, unzip_level
 
 if TYPE_CHECKING:
     from _typeshed import StrPath
 
+    from .classes import Level, SiteMetadata, T
 
-async def async_get_sheet_data(client: httpx.AsyncClient, verified_only=False) -> list[SiteMetadata]:
+
+def async_make_client(*, http2: bool = True, max_connections: int = 100,
+                      max_keepalive_connections: int = 20, retries: int = 0) -> httpx.AsyncClient:
+    """
+    Creates an httpx.AsyncClient that is set up for downloading a lot of levels at once.
+    With HTTP/2, concurrent requests to the same host are multiplexed over a single connection.
+
+    Args:
+        http2 (bool, optional): Whether to enable HTTP/2. Defaults to True.
+        max_connections (int, optional): The maximum number of open connections. Defaults to 100.
+        max_keepalive_connections (int, optional): The maximum number of idle connections kept alive. Defaults to 20.
+        retries (int, optional): How many times to retry a request that failed to connect. Defaults to 0.
+
+    Returns:
+        httpx.AsyncClient: The new client, make sure to close it once you are done with it.
+    """
+
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+    # The client ignores http2 and limits once it's given a transport, so they have to be set on the transport
+    transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits, retries=retries)
+    return httpx.AsyncClient(transport=transport)
+
+
+async def async_get_sheet_data(client: httpx.AsyncClient, verified_only=False,
+                               use_cache: bool = True) -> list[SiteMetadata]:
     """
     Uses the level spreadsheet api to get all the levels.
     If verified_only is True, this will only return verified levels.
+    The response is reused for 5 minutes by later calls with the same client, unless use_cache is False.
 
     Args:
         client (httpx.AsyncClient): The async httpx client to use for the request.
         verified_only (bool, optional): Whether to only return verified levels only. Defaults to False.
+        use_cache (bool, optional): Whether to reuse a recent response instead of fetching fresh data.
+            Defaults to True.
 
     Returns:
         list[SiteMetadata]: Parsed json from sheet api.
     """
 
-    url = 'https://script.google.com/macros/s/AKfycbzm3I9ENulE7uOmze53cyDuj7Igi7fmGiQ6w045fCRxs_sK3D4/exec'
-    r = await client.get(url, follow_redirects=True)
-    r.raise_for_status()
+    content = get_cached(client, SHEET_URL) if use_cache else None
+    if content is None:
+        r = await client.get(SHEET_URL, follow_redirects=True)
+        r.raise_for_status()
+        content = r.content
+        set_cached(client, SHEET_URL, content)
 
-    levels = [SiteMetadata(**level) for level in r.json()]
+    # pydantic is slow to import, so only pull it in when it's actually needed
+    from .classes import SiteMetadata
+
+    # orjson can parse the raw bytes directly, which is a lot faster than r.json()
+    levels = [SiteMetadata(**level) for level in orjson.loads(content)]
 
     if verified_only:
         levels = [x for x in levels if x.verified]
@@ -38,23 +78,37 @@ async def async_get_sheet_data(client: httpx.AsyncClient, verified_only=False) -
     return levels
 
 
-async def async_get_setlists_url(client: httpx.AsyncClient, keep_none=False, trim_none=False) -> dict[str, list[str]]:
+async def async_get_setlists_url(client: httpx.AsyncClient, keep_none=False, trim_none=False,
+                                 use_cache: bool = True) -> dict[str, list[str]]:
     """
     Gets all the urls for the levels on the setlists with a fancy google script.
+    The response is reused for 5 minutes by later calls with the same client, unless use_cache is False.
 
     Args:
         client (httpx.AsyncClient: The async httpx client to use for the request.
         keep_none (bool, optional): Whether to have Nones at all. Defaults to False.
         trim_none (bool, optional): Whether to trim Nones at the start and stop. Defaults to False.
+        use_cache (bool, optional): Whether to reuse a recent response instead of fetching fresh data.
+            Defaults to True.
 
     Returns:
         dict[str, list[str]]: [description]
+
+    Raises:
+        httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from the url.
     """
 
-    url = 'https://script.google.com/macros/s/AKfycbzKbt6JDlvFs0jgR2AqGrjqb6UxnoXjVFmoU4QnEHbCc28Tx7rGMUG-lEm5NklqgBtX/exec'  # noqa:E501
     params = {'keepNull': str(keep_none).lower()}
-    resp = await client.get(url, params=params, follow_redirects=True)
-    json_data = resp.json()
+    cache_key = f'{SETLISTS_URL}?keepNull={params["keepNull"]}'
+
+    content = get_cached(client, cache_key) if use_cache else None
+    if content is None:
+        resp = await client.get(SETLISTS_URL, params=params, follow_redirects=True)
+        resp.raise_for_status()
+        content = resp.content
+        set_cached(client, cache_key, content)
+
+    json_data = orjson.loads(content)
 
     # This request will read a bunch of extra cells, possibly above and below the actual data, resulting
     # in a bunch of extra Nones. We can remove this if wanted
@@ -65,18 +119,20 @@ async def async_get_setlists_url(client: httpx.AsyncClient, keep_none=False, tri
 
 
 async def async_download_level(client: httpx.AsyncClient, url: str, path: StrPath,
-                               filename: Optional[str] = None) -> Path:
+                               filename: Optional[str] = None, ensure_unique: bool = True) -> Path:
     """
     Downloads a level from the given url into the given path.
     Automatically deterimes the filename from the url or request headers, unless manually given a filename.
     If you manually give this a filename, this *will* overwrite any existing files.
-    When automatically determining the filename, a unique name is ensured.
+    When automatically determining the filename, a unique name is ensured, unless ensure_unique is False.
+    When downloading many levels concurrently, use a client from async_make_client().
 
     Args:
         client (httpx.AsyncClient): The async httpx client to use for the request.
         url (str): The url of the level to download.
         path (StrPath): The path to put the downloaded level in.
         filename (str, optional): What to name the level, if None given, will automatically determine it from url.
+        ensure_unique (bool, optional): Whether to rename the level if the filename is taken. Defaults to True.
 
     Raises:
         httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from the url.
@@ -94,24 +150,66 @@ async def async_download_level(client: httpx.AsyncClient, url: str, path: StrPat
         if filename is None:
             url_filename = get_filename(resp)
             full_path = Path(path, url_filename)
-            full_path = rename(full_path)  # Ensure unique filename
+            if ensure_unique:
+                full_path = claim_unique_path(full_path)
         else:
             full_path = Path(path, filename)
 
         try:
             # Write level to file
-            with full_path.open('wb') as file:
-                async for chunk in resp.aiter_bytes():
-                    file.write(chunk)
+            async with aiofiles.open(full_path, 'wb') as file:
+                async for chunk in resp.aiter_bytes(chunk_size=CHUNK_SIZE):
+                    await file.write(chunk)
 
-        except Exception as e:
-            # Clean up after ourselves here if something goes wrong when writing to file.
+        except BaseException as e:
+            # Clean up after ourselves here if something goes wrong when writing to file, or if we're cancelled.
             full_path.unlink()
             raise e
 
     return full_path
 
 
+async def _gather_cancelling(coros: Iterable[Awaitable[T]]) -> list[T]:
+    # Like asyncio.gather, but once one of them fails, the rest are cancelled instead of being left running
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def async_download_levels(client: httpx.AsyncClient, urls: Iterable[str], path: StrPath,
+                                concurrency: int = 16) -> list[Path]:
+    """
+    Downloads many levels into the given path at once with async_download_level().
+    The filenames are automatically determined, and unique names are ensured.
+    If any download fails, the others are cancelled and their partly downloaded files are removed.
+
+    Args:
+        client (httpx.AsyncClient): The async httpx client to use for the requests.
+        urls (Iterable[str]): The urls of the levels to download.
+        path (StrPath): The path to put the downloaded levels in.
+        concurrency (int, optional): The maximum number of levels to download at the same time. Defaults to 16.
+
+    Raises:
+        httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from a url.
+        BadURLFilename: Raised when unable to get a level's filename.
+
+    Returns:
+        list[pathlib.Path]: The full paths to the downloaded levels, in the same order as the urls.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def download(url: str) -> Path:
+        async with semaphore:
+            return await async_download_level(client, url, path)
+
+    return await _gather_cancelling(download(url) for url in urls)
+
+
 async def async_download_unzip(client: httpx.AsyncClient, url: str, output_path: StrPath,
                                create_subfolder=False) -> Path:
     """
@@ -136,18 +234,23 @@ async def async_download_unzip(client: httpx.AsyncClient, url: str, output_path:
     """
 
     with TemporaryDirectory() as tempdir:
-        zipped_path = await async_download_level(client, url, tempdir)
+        zipped_path = await async_download_level(client, url, tempdir, ensure_unique=False)
         output_path = (rename(Path(output_path, zipped_path.stem)) if create_subfolder
                        else Path(output_path))
 
-        unzip_level(zipped_path, output_path)
+        # Unzip in a worker thread so other downloads can continue in the meantime
+        await asyncio.to_thread(unzip_level, zipped_path, output_path)
 
     return output_path
 
 
 async def async_get_filename_from_url(client: httpx.AsyncClient, url: str) -> str:
     """
-    Wraps get_filename() with httpx.AsyncClient.get() to get the filename directly from a url.
+    Wraps get_filename() with httpx.AsyncClient.head() to get the filename directly from a url.
+    Falls back to a GET request if the server doesn't properly respond to the HEAD request.
+    Urls ending with '.rdzip' are resolved without making any request, so redirects aren't followed and the status
+    isn't checked for them. The name may then differ from the one async_download_level() saves the level as,
+    if the url redirects, and a name is returned even for dead links.
 
     Args:
         client (httpx.AsyncClient): The async httpx client to use for the request.
@@ -157,6 +260,19 @@ async def async_get_filename_from_url(client: httpx.AsyncClient, url: str) -> st
         str: The filename of the level
     """
 
+    # Urls ending in .rdzip already tell us the filename, so there's no need to make any request at all
+    url = str(httpx.URL(url))
+    if url.endswith('.rdzip'):
+        return rdzip_url_filename(url)
+
+    # A HEAD request gets us the headers without the server starting to send the level itself
+    resp = await client.head(url, follow_redirects=True)
+    if resp.is_success:
+        try:
+            return get_filename(resp)
+        except BadURLFilename:
+            pass
+
     async with client.stream('GET', url, follow_redirects=True) as resp:  # type: ignore
         resp: httpx.Response
         resp.raise_for_status()
@@ -167,7 +283,7 @@ async def async_get_filename_from_url(client: httpx.AsyncClient, url: str) -> st
 
 async def async_parse_url(client: httpx.AsyncClient, url: str, *, parse_seperate_2p: bool = False) -> Level:
     """
-    Parses the level data from an url, uses download_level to download with parse_rdzip to parse.
+    Parses the level data from an url, downloads the rdzip into memory and parses it with parse_rdzip.
 
     Args:
         client (httpx.AsyncClient): The async httpx client to use for the request.
@@ -178,11 +294,42 @@ async def async_parse_url(client: httpx.AsyncClient, url: str, *, parse_seperate
         Level: The parsed level data
 
     Raises:
+        httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from the url.
         No2PLevel: Raised when attempting to parse a non-existant 2p level.
     """
 
-    with TemporaryDirectory() as tempdirpath:
-        path = await async_download_level(client, url, tempdirpath)
-        output = parse_rdzip(path, parse_seperate_2p=parse_seperate_2p)
+    # We only need to read the rdlevels out of the rdzip, so there's no need to write it to disk
+    resp = await client.get(url, follow_redirects=True)
+    resp.raise_for_status()
+
+    return await asyncio.to_thread(parse_rdzip, BytesIO(resp.content), parse_seperate_2p=parse_seperate_2p)
+
+
+async def async_parse_urls(client: httpx.AsyncClient, urls: Iterable[str], *, parse_seperate_2p: bool = False,
+                           concurrency: int = 16) -> list[Level]:
+    """
+    Parses the level data from many urls at once with async_parse_url().
+    Parsing happens on worker threads, so it overlaps with the downloads that are still running.
+    If any url fails, the other downloads are cancelled.
+
+    Args:
+        client (httpx.AsyncClient): The async httpx client to use for the requests.
+        urls (Iterable[str]): The urls of the levels to download and parse.
+        parse_seperate_2p (bool, optional): Whether to parse the seperate 2P level bundled in each rdzip.
+        concurrency (int, optional): The maximum number of levels to download at the same time. Defaults to 16.
+
+    Returns:
+        list[Level]: The parsed level data, in the same order as the urls.
+
+    Raises:
+        httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from a url.
+        No2PLevel: Raised when attempting to parse a non-existant 2p level.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def parse(url: str) -> Level:
+        async with semaphore:
+            return await async_parse_url(client, url, parse_seperate_2p=parse_seperate_2p)
 
-    return output
+    return await _gather_cancelling(parse(url) for url in urls)
@@ -1,14 +1,26 @@
 from datetime import datetime
 from enum import Enum
-from typing import Any, Optional, TypeVar
+from typing import Annotated, Any, Optional, TypeVar
 from warnings import warn
 
 from aenum import MultiValueEnum
-from pydantic import BaseModel, Extra, Field, HttpUrl, validator
+from pydantic import (BaseModel, ConfigDict, Field, HttpUrl, PlainSerializer, ValidatorFunctionWrapHandler,
+                      WrapValidator, field_validator)
 
 T = TypeVar('T')
 
 
+def _keep_original_url(url: Any, handler: ValidatorFunctionWrapHandler) -> str:
+    # Validate it as an HttpUrl, but keep the url exactly as given. pydantic v2 normalises urls (lowercased hosts,
+    # trailing slashes, ...), so they wouldn't match the same url elsewhere anymore, e.g. in the setlists
+    handler(url)
+    return url if isinstance(url, str) else str(url)
+
+
+# HttpUrl isn't a str subclass anymore in pydantic v2, so validate urls but keep them as plain strings
+HttpUrlString = Annotated[HttpUrl, WrapValidator(_keep_original_url), PlainSerializer(str, return_type=str)]
+
+
 def to_camel(string: str) -> str:
     first, *rest = string.split("_")
     return first + ''.join(word.capitalize() for word in rest)
@@ -21,6 +33,11 @@ class Difficulty(str, Enum):
     VERY_TOUGH = 'VeryTough'
 
 
+# Built once, so that the difficulty validator doesn't have to rebuild these for every level
+_DIFFICULTIES_BY_VALUE = {e.value: e for e in Difficulty}
+_DIFFICULTIES_BY_NAME = {e.name: e for e in Difficulty}
+
+
 class SpecialArtistType(str, Enum):
     NONE = 'None'
     AUTHOR_IS_ARTIST = 'AuthorIsArtist'
@@ -52,55 +69,69 @@ class PartialSettings(BaseModel):
     seizure_warning: Optional[bool] = None  # maybe use strict bool here  Should this be optional? default to false?
     tags: list[str]
 
-    class Config:
-        extra = Extra.forbid
+    model_config = ConfigDict(extra='forbid', coerce_numbers_to_str=True)
 
-    @validator('difficulty', pre=True)
+    @field_validator('difficulty', mode='before')
+    @classmethod
     def set_difficulty(cls, difficulty_input: Any) -> Difficulty:
         if isinstance(difficulty_input, Difficulty):
             return difficulty_input
 
-        if difficulty_input in {e.value for e in Difficulty}:
-            return Difficulty(difficulty_input)
+        if difficulty_input in _DIFFICULTIES_BY_VALUE:
+            return _DIFFICULTIES_BY_VALUE[difficulty_input]
 
-        if difficulty_input in {e.name for e in Difficulty}:
-            return Difficulty[difficulty_input]
+        if difficulty_input in _DIFFICULTIES_BY_NAME:
+            return _DIFFICULTIES_BY_NAME[difficulty_input]
 
         # CLS defaults to Easy when the difficulty is invalid
         warn(f'Invalid difficulty "{difficulty_input}", defaulting to {Difficulty.EASY}.')
         return Difficulty.EASY
 
-    @validator('tags')
+    @field_validator('tags')
+    @classmethod
     def remove_empty_strings(cls, tags: list[str]) -> list[str]:
         return [tag for tag in tags if tag]
 
 
 class SiteMetadata(PartialSettings):
-    download_url: HttpUrl
-    preview_img: Optional[HttpUrl]
+    download_url: HttpUrlString
+    preview_img: Optional[HttpUrlString] = None
     last_updated: datetime
-    max_bpm: Optional[float]
-    min_bpm: Optional[float]
+    max_bpm: Optional[float] = None
+    min_bpm: Optional[float] = None
     single_player: bool  # TODO: Decide how to reconcile this with LevelSettings
     two_player: bool
     verified: Optional[bool] = None
 
-    class Config:
-        extra = Extra.forbid
-
-    @validator('preview_img', pre=True)
+    @field_validator('preview_img', mode='before')
+    @classmethod
     def fix_empty_urls(cls, url: Any) -> Any:
         return url if url else None
 
+    @classmethod
+    def from_trusted(cls, data: dict[str, Any]) -> 'SiteMetadata':
+        """
+        Creates a SiteMetadata without running any validation, which is a lot faster for big lists of levels.
+        Only use this with data that has already been validated, e.g. from model_dump() of a cached sheet.
+
+        Args:
+            data (dict[str, Any]): The already validated fields of the level.
+
+        Returns:
+            SiteMetadata: The level metadata.
+        """
+
+        return cls.model_construct(**data)
+
 
 class LevelSettings(PartialSettings):
     version: int
     syringe_icon: str
-    special_artist_type: Optional[SpecialArtistType]  # make sure artist type None doesn't get turned into normal None
+    special_artist_type: Optional[SpecialArtistType] = None  # make sure artist type None doesn't turn into normal None
     song_name_hue: float
     separate_2p_level_filename: str = Field(alias="separate2PLevelFilename")  # TODO: variable naming?
-    rank_max_mistakes: list[int] = Field(..., max_items=4, min_items=4)
-    rank_description: list[str] = Field(..., max_items=6, min_items=6)
+    rank_max_mistakes: list[int] = Field(..., max_length=4, min_length=4)
+    rank_description: list[str] = Field(..., max_length=6, min_length=6)
     preview_song: str
     preview_song_start_time: float
     preview_song_duration: float
@@ -115,10 +146,10 @@ class LevelSettings(PartialSettings):
     mods: Optional[str] = None
     custom_class: Optional[str] = None
 
-    class Config:
-        alias_generator = to_camel
+    model_config = ConfigDict(alias_generator=to_camel)
 
-    @validator('tags', pre=True)
+    @field_validator('tags', mode='before')
+    @classmethod
     def split_tags(cls, tags_string: str) -> list[str]:
         return [tag.strip() for tag in tags_string.split(',')]
 
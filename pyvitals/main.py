@@ -1,30 +1,79 @@
 from __future__ import annotations
 
+import mmap
+import os
 import re
-from copy import copy
+from codecs import BOM_UTF8
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import TYPE_CHECKING, BinaryIO, Optional, Union
-from zipfile import ZipFile, is_zipfile
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterable, Optional, Union
+from zipfile import ZipFile, ZipInfo, is_zipfile
 
 import httpx
-import rapidjson
+import orjson
 
-from .classes import Level, SiteMetadata, T
+from ._shared import (BAD_FILENAME_CHARS_TABLE, SETLISTS_URL, SHEET_URL, claim_unique_path, get_cached,
+                      rdzip_url_filename, rename, set_cached)
 from .exceptions import BadRDZipFile, BadURLFilename, No2PLevel
 
 if TYPE_CHECKING:
     from _typeshed import StrPath, SupportsRead
 
+    from .classes import Level, SiteMetadata, T
 
-def get_sheet_data(client: httpx.Client, verified_only: bool = False) -> list[SiteMetadata]:
+# Size of the chunks to read when streaming a level to disk
+CHUNK_SIZE = 1024 * 1024
+
+# Matches the weird missing commas in some levels. Thanks WillFlame for the magic regex
+_MISSING_COMMA_RE = re.compile(r'\": ([0-9]|[1-9][0-9]|100|\[[0-3](, [0-3])*\]|\"([a-zA-Z]|[0-9])*\") \"')
+
+# Extracts the filename from a Content-Disposition header
+_CONTENT_DISPOSITION_FILENAME_RE = re.compile(r'filename[^;=\n]*=(([\'"]).*?\2|[^;\n]*)')
+
+# Translation table that deletes newlines and tabs, str.translate is a lot faster than a regex for this
+_NEWLINES_TABLE = str.maketrans('', '', '\r\n\t')
+
+# Only bother extracting on multiple threads when an rdzip has more entries or compressed bytes than this
+_PARALLEL_UNZIP_MIN_ENTRIES = 8
+_PARALLEL_UNZIP_MIN_SIZE = 1024 * 1024
+
+
+def make_client(*, http2: bool = True, max_connections: int = 100, max_keepalive_connections: int = 20,
+                retries: int = 0) -> httpx.Client:
+    """
+    Creates an httpx.Client that is set up for downloading a lot of levels, e.g. from multiple threads.
+    With HTTP/2, concurrent requests to the same host are multiplexed over a single connection.
+
+    Args:
+        http2 (bool, optional): Whether to enable HTTP/2. Defaults to True.
+        max_connections (int, optional): The maximum number of open connections. Defaults to 100.
+        max_keepalive_connections (int, optional): The maximum number of idle connections kept alive. Defaults to 20.
+        retries (int, optional): How many times to retry a request that failed to connect. Defaults to 0.
+
+    Returns:
+        httpx.Client: The new client, make sure to close it once you are done with it.
+    """
+
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+    # The client ignores http2 and limits once it's given a transport, so they have to be set on the transport
+    transport = httpx.HTTPTransport(http2=http2, limits=limits, retries=retries)
+    return httpx.Client(transport=transport)
+
+
+def get_sheet_data(client: httpx.Client, verified_only: bool = False, use_cache: bool = True) -> list[SiteMetadata]:
     """
     Uses the level spreadsheet api to get all the levels.
     If verified_only is True, this will only return verified levels.
+    The response is reused for 5 minutes by later calls with the same client, unless use_cache is False.
 
     Args:
         client (httpx.Client): The httpx client to use for the request.
         verified_only (bool, optional): Whether to only return verified levels only. Defaults to False.
+        use_cache (bool, optional): Whether to reuse a recent response instead of fetching fresh data.
+            Defaults to True.
 
     Returns:
         list[SiteMetadata]: Parsed json from sheet api.
@@ -33,11 +82,18 @@ def get_sheet_data(client: httpx.Client, verified_only: bool = False) -> list[Si
         httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from the url.
     """
 
-    url = 'https://script.google.com/macros/s/AKfycbzm3I9ENulE7uOmze53cyDuj7Igi7fmGiQ6w045fCRxs_sK3D4/exec'
-    r = client.get(url, follow_redirects=True)
-    r.raise_for_status()
+    content = get_cached(client, SHEET_URL) if use_cache else None
+    if content is None:
+        r = client.get(SHEET_URL, follow_redirects=True)
+        r.raise_for_status()
+        content = r.content
+        set_cached(client, SHEET_URL, content)
+
+    # pydantic is slow to import, so only pull it in when it's actually needed
+    from .classes import SiteMetadata
 
-    levels = [SiteMetadata(**level) for level in r.json()]
+    # orjson can parse the raw bytes directly, which is a lot faster than r.json()
+    levels = [SiteMetadata(**level) for level in orjson.loads(content)]
 
     if verified_only:
         levels = [x for x in levels if x.verified]
@@ -45,22 +101,37 @@ def get_sheet_data(client: httpx.Client, verified_only: bool = False) -> list[Si
     return levels
 
 
-def get_setlists_url(client: httpx.Client, keep_none: bool = False, trim_none: bool = False) -> dict[str, list[str]]:
+def get_setlists_url(client: httpx.Client, keep_none: bool = False, trim_none: bool = False,
+                     use_cache: bool = True) -> dict[str, list[str]]:
     """
     Gets all the urls for the levels on the setlists with a fancy google script.
+    The response is reused for 5 minutes by later calls with the same client, unless use_cache is False.
 
     Args:
         client (httpx.Client): The httpx client to use for the request.
         keep_none (bool, optional): Whether to have Nones at all. Defaults to False.
         trim_none (bool, optional): Whether to trim Nones at the start and stop. Defaults to False.
+        use_cache (bool, optional): Whether to reuse a recent response instead of fetching fresh data.
+            Defaults to True.
 
     Returns:
         dict[str, list[str]]: [description]
+
+    Raises:
+        httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from the url.
     """
 
-    url = 'https://script.google.com/macros/s/AKfycbzKbt6JDlvFs0jgR2AqGrjqb6UxnoXjVFmoU4QnEHbCc28Tx7rGMUG-lEm5NklqgBtX/exec'  # noqa:E501
     params = {'keepNull': str(keep_none).lower()}
-    json_data = client.get(url, params=params, follow_redirects=True).json()
+    cache_key = f'{SETLISTS_URL}?keepNull={params["keepNull"]}'
+
+    content = get_cached(client, cache_key) if use_cache else None
+    if content is None:
+        r = client.get(SETLISTS_URL, params=params, follow_redirects=True)
+        r.raise_for_status()
+        content = r.content
+        set_cached(client, cache_key, content)
+
+    json_data = orjson.loads(content)
 
     # This request will read a bunch of extra cells, possibly above and below the actual data, resulting
     # in a bunch of extra Nones. We can remove this if wanted
@@ -81,15 +152,16 @@ def trim_list(input_list: list[T]) -> list[T]:
         list[T]: A trimmed version of the input.
     """
 
-    input_copy = copy(input_list)
+    # Find the bounds first and slice once, deleting from the front of a list one by one is quadratic
+    start, end = 0, len(input_list)
 
-    while input_copy and not input_copy[0]:
-        del input_copy[0]
+    while start < end and not input_list[start]:
+        start += 1
 
-    while input_copy and not input_copy[-1]:
-        del input_copy[-1]
+    while end > start and not input_list[end - 1]:
+        end -= 1
 
-    return input_copy
+    return input_list[start:end]
 
 
 def get_filename(r: httpx.Response) -> str:
@@ -112,30 +184,31 @@ def get_filename(r: httpx.Response) -> str:
     url = str(r.url)
 
     if url.endswith('.rdzip'):
-        name = url.rsplit('/', 1)[-1]
-    else:
-        header = r.headers.get('Content-Disposition')
+        return rdzip_url_filename(url)
 
-        if header is None:
-            raise BadURLFilename(f"Could not find Content-Disposition header for {url}", url)
+    header = r.headers.get('Content-Disposition')
 
-        match = re.search(r'filename[^;=\n]*=(([\'"]).*?\2|[^;\n]*)', header)
+    if header is None:
+        raise BadURLFilename(f"Could not find Content-Disposition header for {url}", url)
 
-        if match is None:
-            raise BadURLFilename(f"Could not extract filename from Content-Disposition for {url}", url)
+    match = _CONTENT_DISPOSITION_FILENAME_RE.search(header)
 
-        name = match.group(1)
+    if match is None:
+        raise BadURLFilename(f"Could not extract filename from Content-Disposition for {url}", url)
 
-    # Remove the characters that windows doesn't like in filenames
-    for char in r'<>:"/\|?*':
-        name = name.replace(char, '')
+    name = match.group(1)
 
-    return name
+    # Remove the characters that windows doesn't like in filenames
+    return name.translate(BAD_FILENAME_CHARS_TABLE)
 
 
 def get_filename_from_url(client: httpx.Client, url: str) -> str:
     """
-    Wraps get_filename() with requests.get() to get the filename directly from a url.
+    Wraps get_filename() with httpx.Client.head() to get the filename directly from a url.
+    Falls back to a GET request if the server doesn't properly respond to the HEAD request.
+    Urls ending with '.rdzip' are resolved without making any request, so redirects aren't followed and the status
+    isn't checked for them. The name may then differ from the one download_level() saves the level as,
+    if the url redirects, and a name is returned even for dead links.
 
     Args:
         client (httpx.Client): httpx client to use for the request
@@ -145,6 +218,19 @@ def get_filename_from_url(client: httpx.Client, url: str) -> str:
         str: The filename of the level.
     """
 
+    # Urls ending in .rdzip already tell us the filename, so there's no need to make any request at all
+    url = str(httpx.URL(url))
+    if url.endswith('.rdzip'):
+        return rdzip_url_filename(url)
+
+    # A HEAD request gets us the headers without the server starting to send the level itself
+    r = client.head(url, follow_redirects=True)
+    if r.is_success:
+        try:
+            return get_filename(r)
+        except BadURLFilename:
+            pass
+
     with client.stream('GET', url, follow_redirects=True) as r:
         r.raise_for_status()
         filename = get_filename(r)
@@ -152,34 +238,20 @@ def get_filename_from_url(client: httpx.Client, url: str) -> str:
     return filename
 
 
-def rename(path: Path) -> Path:
-    """
-    Given some path, returns a file path that doesn't already exist.
-    This is used to ensure that unique file names are always used.
-    """
-
-    if not path.exists():
-        return path
-
-    index = 2
-    while path.with_stem(path.stem + f" ({index})").exists():
-        index += 1
-
-    return path.with_stem(path.stem + f" ({index})")
-
-
-def download_level(client: httpx.Client, url: str, path: StrPath, filename: Optional[str] = None) -> Path:
+def download_level(client: httpx.Client, url: str, path: StrPath, filename: Optional[str] = None,
+                   ensure_unique: bool = True) -> Path:
     """
     Downloads a level from the given url into the given path.
     Automatically deterimes the filename from the url or request headers, unless manually given a filename.
     If you manually give this a filename, this *will* overwrite any existing files.
-    When automatically determining the filename, a unique name is ensured.
+    When automatically determining the filename, a unique name is ensured, unless ensure_unique is False.
 
     Args:
         client (httpx.Client) : The httpx client to use for the request.
         url (str): The url of the level to download.
         path (StrPath): The path to put the downloaded level in.
         filename (str, optional): What to name the level, if None given, will automatically determine it from url.
+        ensure_unique (bool, optional): Whether to rename the level if the filename is taken. Defaults to True.
 
     Raises:
         httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from the url.
@@ -196,14 +268,15 @@ def download_level(client: httpx.Client, url: str, path: StrPath, filename: Opti
         if filename is None:
             url_filename = get_filename(r)
             full_path = Path(path, url_filename)
-            full_path = rename(full_path)  # Ensure unique filename
+            if ensure_unique:
+                full_path = claim_unique_path(full_path)
         else:
             full_path = Path(path, filename)
 
         try:
             # Write level to file
             with full_path.open('wb') as file:
-                for chunk in r.iter_bytes():
+                for chunk in r.iter_bytes(chunk_size=CHUNK_SIZE):
                     file.write(chunk)
 
         except Exception as e:
@@ -214,6 +287,30 @@ def download_level(client: httpx.Client, url: str, path: StrPath, filename: Opti
     return full_path
 
 
+def download_levels(client: httpx.Client, urls: Iterable[str], path: StrPath, max_workers: int = 16) -> list[Path]:
+    """
+    Downloads many levels into the given path at once with download_level(), spreading them over multiple threads.
+    The filenames are automatically determined, and unique names are ensured.
+    For best results, use a client from make_client().
+
+    Args:
+        client (httpx.Client): The httpx client to use for the requests.
+        urls (Iterable[str]): The urls of the levels to download.
+        path (StrPath): The path to put the downloaded levels in.
+        max_workers (int, optional): The maximum number of levels to download at the same time. Defaults to 16.
+
+    Raises:
+        httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from a url.
+        BadURLFilename: Raised when unable to get a level's filename.
+
+    Returns:
+        list[pathlib.Path]: The full paths to the downloaded levels, in the same order as the urls.
+    """
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda url: download_level(client, url, path), urls))
+
+
 def download_unzip(client: httpx.Client, url: str, output_path: StrPath, create_subfolder: bool = False) -> Path:
     """
     Downloads a level into a temporary folder with download_level(), then unzips it into the given path.
@@ -236,7 +333,7 @@ def download_unzip(client: httpx.Client, url: str, output_path: StrPath, create_
         pathlib.Path: The full path to the unzipped level.
     """
     with TemporaryDirectory() as tempdir:
-        zipped_path = download_level(client, url, tempdir)
+        zipped_path = download_level(client, url, tempdir, ensure_unique=False)
         output_path = (rename(Path(output_path, zipped_path.stem)) if create_subfolder
                        else Path(output_path))
 
@@ -264,18 +361,51 @@ def unzip_level(input_path: Path, output_path: Path) -> None:
 
     try:
         with ZipFile(input_path, 'r') as zip:
-            zip.extractall(output_path)
+            infos = zip.infolist()
+            workers = min(os.cpu_count() or 1, len(infos))
+
+            if workers <= 1 or (len(infos) <= _PARALLEL_UNZIP_MIN_ENTRIES
+                                and sum(info.compress_size for info in infos) <= _PARALLEL_UNZIP_MIN_SIZE):
+                zip.extractall(output_path)
+                return
+
+        # zlib releases the GIL while decompressing, so big rdzips extract a lot faster spread over a few threads
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            chunks = [infos[i::workers] for i in range(workers)]
+            for _ in executor.map(_extract_members, [input_path] * workers, chunks, [output_path] * workers):
+                pass
 
     except OSError:
         raise BadRDZipFile(f"{input_path} was unable to be unzipped, maybe it contains invalid file names.", input_path)
 
 
+def _extract_members(input_path: Path, infos: list[ZipInfo], output_path: Path) -> None:
+    # ZipFile isn't safe to read from multiple threads at once, so each worker opens its own
+    with ZipFile(input_path, 'r') as zip:
+        for info in infos:
+            try:
+                zip.extract(info, output_path)
+            except FileExistsError:
+                # Another worker created the same parent directory between zipfile's exists check and makedirs
+                zip.extract(info, output_path)
+
+
+def _loads_level_json(text: str) -> Any:
+    # Try orjson first as it's much faster, but fall back to rapidjson as it allows for trailing commas
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # Most levels never get here, so don't pay for importing rapidjson unless we need it
+        import rapidjson
+        return rapidjson.loads(text, parse_mode=rapidjson.PM_TRAILING_COMMAS)
+
+
 def parse_level(file: Union[str, SupportsRead[str]]) -> Level:
     """
     Parses the .rdlevel and fixes errors in the level.
-    Uses rapidjson as it allows for trailing commas, while still being somewhat performant.
-    Attempts to fix problems with the rdlevel json by fixing some missing commas,
-    as well as removing all newlines and tabs.
+    Uses orjson when the level is valid json, otherwise uses rapidjson as it allows for trailing commas.
+    If that fails, attempts to fix problems with the rdlevel json by fixing some missing commas,
+    as well as removing all newlines and tabs, and then tries again.
 
     Args:
         path (str | SupportsRead[str]): String content or file-like object of the .rdlevel
@@ -286,26 +416,67 @@ def parse_level(file: Union[str, SupportsRead[str]]) -> Level:
 
     text = file if isinstance(file, str) else file.read()
 
-    # Fixes weird missing commas. Thanks WillFlame for the magic regex
-    text = re.sub(r'\": ([0-9]|[1-9][0-9]|100|\[[0-3](, [0-3])*\]|\"([a-zA-Z]|[0-9])*\") \"', r'": \1, "', text)
+    try:
+        # Most levels are fine as they are, so don't bother with the fixes below unless we need to
+        data = _loads_level_json(text)
+
+    except ValueError:  # Both orjson and rapidjson decode errors are ValueErrors
+        # Fixes weird missing commas
+        text = _MISSING_COMMA_RE.sub(r'": \1, "', text)
+
+        # Fixes bad newlines
+        # TODO: Make this less destructive
+        text = text.translate(_NEWLINES_TABLE)
 
-    # Fixes bad newlines
-    # TODO: Make this less destructive
-    text = re.sub(r'(\r\n|\n|\r|\t)', '', text)
+        data = _loads_level_json(text)
 
-    # Use rapidjson as it allows for trailing commas
-    data = rapidjson.loads(text, parse_mode=rapidjson.PM_TRAILING_COMMAS)
+    return _build_level(data)
 
+
+def _build_level(data: Any) -> Level:
     if data['settings']['author'] == "among drip":
         return data
 
+    from .classes import Level
     return Level(**data)
 
 
+def _parse_level_file(path: StrPath) -> Level:
+    with open(path, 'rb') as file:
+        try:
+            # orjson can parse most levels straight out of the mapped file, skipping decoding the whole level to a str
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                start = len(BOM_UTF8) if view[:len(BOM_UTF8)] == BOM_UTF8 else 0
+                with view[start:] as body:
+                    data = orjson.loads(body)
+
+        except ValueError:  # Either the level needs fixing up, or it's empty and can't be mapped
+            file.seek(0)
+            return parse_level(file.read().decode('utf-8-sig'))
+
+    return _build_level(data)
+
+
+def parse_levels(paths: Iterable[StrPath], max_workers: Optional[int] = None) -> list[Level]:
+    """
+    Parses many .rdlevel files at once with parse_level, spreading the work over multiple processes.
+
+    Args:
+        paths (Iterable[StrPath]): Paths to the .rdlevel files to parse.
+        max_workers (int, optional): How many processes to use. Defaults to the number of processors on the machine.
+
+    Returns:
+        list[Level]: The parsed level data, in the same order as the given paths.
+    """
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_parse_level_file, paths))
+
+
 def parse_rdzip(path: Union[StrPath, BinaryIO], *, parse_seperate_2p: bool = False) -> Level:
     """
     Parses the level data directly from an .rdzip file, assumes main.rdlevel as the level to parse.
-    This will unzip it to a temporary directory and use parse_level to parse it.
+    Only the rdlevel is read out of the rdzip, the rest of the assets are never decompressed.
 
     Args:
         path (StrPath | BinaryIO): Path to or file-like object of the .rdzip to parse
@@ -315,10 +486,17 @@ def parse_rdzip(path: Union[StrPath, BinaryIO], *, parse_seperate_2p: bool = Fal
         Level: The parsed level data
 
     Raises:
+        BadRDZipFile: Raised when the rdzip doesn't contain a main.rdlevel.
         No2PLevel: Raised when attempting to parse a non-existant 2p level.
     """
 
     with ZipFile(path, 'r') as zip:
+        if "main.rdlevel" not in zip.NameToInfo:
+            # File-like objects, like the BytesIO from parse_url, usually don't have a name worth showing
+            name = getattr(path, 'name', path)
+            name = name if isinstance(name, (str, os.PathLike)) else "The rdzip"
+            raise BadRDZipFile(f"{name} doesn't contain a main.rdlevel.", path)
+
         with zip.open("main.rdlevel", 'r') as rdlevel:
             level_str = rdlevel.read().decode('utf-8-sig')
             output = parse_level(level_str)
@@ -326,7 +504,7 @@ def parse_rdzip(path: Union[StrPath, BinaryIO], *, parse_seperate_2p: bool = Fal
         if parse_seperate_2p:
             two_p_filename = output.settings.separate_2p_level_filename
 
-            if not two_p_filename or two_p_filename not in zip.filelist:
+            if not two_p_filename or two_p_filename not in zip.NameToInfo:
                 raise No2PLevel("Unable to find a 2 player level.")
 
             with zip.open(two_p_filename, 'r') as rdlevel:
@@ -336,9 +514,54 @@ def parse_rdzip(path: Union[StrPath, BinaryIO], *, parse_seperate_2p: bool = Fal
     return output
 
 
+def parse_rdzip_all(path: Union[StrPath, BinaryIO]) -> dict[str, Level]:
+    """
+    Parses every .rdlevel bundled in an .rdzip file, opening the rdzip only once.
+
+    Args:
+        path (StrPath | BinaryIO): Path to or file-like object of the .rdzip to parse
+
+    Returns:
+        dict[str, Level]: The parsed level data, keyed by the name of the .rdlevel in the rdzip.
+    """
+
+    output = {}
+    with ZipFile(path, 'r') as zip:
+        for name in zip.NameToInfo:
+            if not name.endswith('.rdlevel'):
+                continue
+
+            with zip.open(name, 'r') as rdlevel:
+                output[name] = parse_level(rdlevel.read().decode('utf-8-sig'))
+
+    return output
+
+
+def parse_rdzips(paths: Iterable[StrPath], *, parse_seperate_2p: bool = False,
+                 max_workers: Optional[int] = None) -> list[Level]:
+    """
+    Parses many .rdzip files at once with parse_rdzip, spreading the work over multiple processes.
+
+    Args:
+        paths (Iterable[StrPath]): Paths to the .rdzip files to parse.
+        parse_seperate_2p (bool, optional): Whether to parse the seperate 2P level bundled in each rdzip.
+        max_workers (int, optional): How many processes to use. Defaults to the number of processors on the machine.
+
+    Returns:
+        list[Level]: The parsed level data, in the same order as the given paths.
+
+    Raises:
+        BadRDZipFile: Raised when an rdzip doesn't contain a main.rdlevel.
+        No2PLevel: Raised when attempting to parse a non-existant 2p level.
+    """
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(partial(parse_rdzip, parse_seperate_2p=parse_seperate_2p), paths))
+
+
 def parse_url(client: httpx.Client, url: str, *, parse_seperate_2p: bool = False) -> Level:
     """
-    Parses the level data from an url, uses download_level to download with parse_rdzip to parse.
+    Parses the level data from an url, downloads the rdzip into memory and parses it with parse_rdzip.
 
     Args:
         client (httpx.Client): httpx client to use for the request
@@ -349,11 +572,36 @@ def parse_url(client: httpx.Client, url: str, *, parse_seperate_2p: bool = False
         Level: The parsed level data
 
     Raises:
+        httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from the url.
         No2PLevel: Raised when attempting to parse a non-existant 2p level.
     """
 
-    with TemporaryDirectory() as tempdir:
-        path = download_level(client, url, tempdir)
-        output = parse_rdzip(path, parse_seperate_2p=parse_seperate_2p)
+    # We only need to read the rdlevels out of the rdzip, so there's no need to write it to disk
+    r = client.get(url, follow_redirects=True)
+    r.raise_for_status()
 
-    return output
+    return parse_rdzip(BytesIO(r.content), parse_seperate_2p=parse_seperate_2p)
+
+
+def parse_urls(client: httpx.Client, urls: Iterable[str], *, parse_seperate_2p: bool = False,
+               max_workers: int = 16) -> list[Level]:
+    """
+    Parses the level data from many urls at once with parse_url(), spreading them over multiple threads.
+    For best results, use a client from make_client().
+
+    Args:
+        client (httpx.Client): The httpx client to use for the requests.
+        urls (Iterable[str]): The urls of the levels to download and parse.
+        parse_seperate_2p (bool, optional): Whether to parse the seperate 2P level bundled in each rdzip.
+        max_workers (int, optional): The maximum number of levels to download at the same time. Defaults to 16.
+
+    Returns:
+        list[Level]: The parsed level data, in the same order as the urls.
+
+    Raises:
+        httpx.HTTPStatusError: Raised when we receive an error (greater than 400) response code from a url.
+        No2PLevel: Raised when attempting to parse a non-existant 2p level.
+    """
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(partial(parse_url, client, parse_seperate_2p=parse_seperate_2p), urls))
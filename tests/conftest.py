@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "slow: downloads a lot or goes through every level, needs PYVITALS_SLOW=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Tests that download a lot or go through every level only run when PYVITALS_SLOW=1 is set
+    if os.environ.get('PYVITALS_SLOW') == '1':
+        return
+
+    skip_slow = pytest.mark.skip(reason="slow test, set PYVITALS_SLOW=1 to run it")
+    for item in items:
+        if 'slow' in item.keywords:
+            item.add_marker(skip_slow)
@@ -0,0 +1,84 @@
+"""Things shared between the sync and async tests."""
+
+import hashlib
+from pathlib import Path
+from typing import Callable, Union
+
+import httpx
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+TESTING_LEVELS = [
+    {
+        "url": "https://cdn.discordapp.com/attachments/611380148431749151/624806831050457099/Bill_Wurtz_-_Chips.rdzip",  # noqa:E501
+        "name": "Bill_Wurtz_-_Chips.rdzip",
+        "size": 314311,
+        "md5sum": "83d6224500de3e43535c4eca87afb2df"
+    },
+    {
+        "url": "https://www.dropbox.com/s/ppomi3tg6ovgkuo?dl=1",
+        "name": "9999_1 - 23.exe - YY.rdzip",
+        "size": 95249907,
+        "md5sum": "89ba382901a96287a7e9653a13b2661c"
+    },
+    {
+        "url": "https://drive.google.com/uc?export=download&id=1LZ5KWG4KCL1Or-kSYimbVaSFIoTrGgsI",
+        "name": "Lemon Demon - Angry People.rdzip",
+        "size": 22337449,
+        "md5sum": "188e43b30feb9bcb0848e422843ff894"
+    },
+    {
+        "url": "https://cdn.discordapp.com/attachments/611380148431749151/738933182044438639/The_Lick_in_all_12_keys.rdzip",  # noqa:E501
+        "name": "The_Lick_in_all_12_keys.rdzip",
+        "size": 725621,
+        "md5sum": "314423b4408319d366b3d0c24606ea87"
+    },
+]
+
+# Downloaded after TESTING_LEVELS, so the duplicate url reliably gets renamed
+TESTING_LEVELS_RENAMED = [
+    {
+        "url": "https://cdn.discordapp.com/attachments/611380148431749151/624806831050457099/Bill_Wurtz_-_Chips.rdzip",  # noqa:E501
+        "name": "Bill_Wurtz_-_Chips (2).rdzip",
+        "size": 314311,
+        "md5sum": "83d6224500de3e43535c4eca87afb2df"
+    },
+]
+
+
+def md5_of(path: Union[str, Path]) -> str:
+    """Hashes a file in chunks, so big levels don't have to be read into memory all at once."""
+
+    with open(path, 'rb') as file:
+        # file_digest (python 3.11+) reads into one reused buffer instead of making a new bytes object per chunk
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(file, 'md5').hexdigest()
+
+        md5 = hashlib.md5()
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            md5.update(chunk)
+
+    return md5.hexdigest()
+
+
+def filename_handler(head_status: int, head_disposition: bool,
+                     methods: list[str]) -> Callable[[httpx.Request], httpx.Response]:
+    """Serves a level named in its Content-Disposition, with a HEAD response set up as given."""
+
+    disposition = {'Content-Disposition': 'attachment; filename="level.rdzip"'}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        if request.method == 'HEAD':
+            return httpx.Response(head_status, headers=disposition if head_disposition else {})
+        return httpx.Response(200, headers=disposition, content=b'level')
+
+    return handler
+
+
+# (HEAD status, whether HEAD has a Content-Disposition, the requests that should be made)
+FILENAME_FALLBACK_CASES = [
+    (405, False, ['HEAD', 'GET']),
+    (200, False, ['HEAD', 'GET']),
+    (200, True, ['HEAD']),
+]
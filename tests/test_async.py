@@ -1,13 +1,19 @@
 import asyncio
-import hashlib
+import io
 import os
+import zipfile
 from tempfile import TemporaryDirectory
 
 import httpx
 import pytest
 import pyvitals
+from helpers import FILENAME_FALLBACK_CASES, TESTING_LEVELS, TESTING_LEVELS_RENAMED, filename_handler, md5_of
 
 CLIENT_TIMEOUT = None
+# How many filename lookups to have in flight at once, much higher than this and hosts start throttling us
+FILENAME_CONCURRENCY = 16
+# How many test levels to download at once
+DOWNLOAD_CONCURRENCY = 4
 
 
 async def gather_with_concurrency(n: int, *tasks):
@@ -20,57 +26,35 @@ async def gather_with_concurrency(n: int, *tasks):
     return await asyncio.gather(*(sem_task(task) for task in tasks))
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_download_levels():
     """Check the filename, filesize, and hash of a few preset levels"""
 
-    levels = [
-        {
-            "url": "https://cdn.discordapp.com/attachments/611380148431749151/624806831050457099/Bill_Wurtz_-_Chips.rdzip",  # noqa:E501
-            "name": "Bill_Wurtz_-_Chips.rdzip",
-            "size": 314311,
-            "md5sum": "83d6224500de3e43535c4eca87afb2df"
-        },
-        {
-            "url": "https://www.dropbox.com/s/ppomi3tg6ovgkuo?dl=1",
-            "name": "9999_1 - 23.exe - YY.rdzip",
-            "size": 95249907,
-            "md5sum": "89ba382901a96287a7e9653a13b2661c"
-        },
-        {
-            "url": "https://drive.google.com/uc?export=download&id=1LZ5KWG4KCL1Or-kSYimbVaSFIoTrGgsI",
-            "name": "Lemon Demon - Angry People.rdzip",
-            "size": 22337449,
-            "md5sum": "188e43b30feb9bcb0848e422843ff894"
-        },
-        {
-            "url": "https://cdn.discordapp.com/attachments/611380148431749151/738933182044438639/The_Lick_in_all_12_keys.rdzip",  # noqa:E501
-            "name": "The_Lick_in_all_12_keys.rdzip",
-            "size": 725621,
-            "md5sum": "314423b4408319d366b3d0c24606ea87"
-        },
-    ]
-    levels2 = [
-        {
-            "url": "https://cdn.discordapp.com/attachments/611380148431749151/624806831050457099/Bill_Wurtz_-_Chips.rdzip",  # noqa:E501
-            "name": "Bill_Wurtz_-_Chips (2).rdzip",
-            "size": 314311,
-            "md5sum": "83d6224500de3e43535c4eca87afb2df"
-        },
-    ]
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
 
     async def check_level(level: dict) -> None:
-        level_path = await pyvitals.async_download_level(client, level['url'], tempdir)
+        async with semaphore:
+            level_path = await pyvitals.async_download_level(client, level['url'], tempdir)
 
         assert level['name'] == os.path.basename(level_path)
         assert level['size'] == os.path.getsize(level_path)
-        with open(level_path, 'rb') as file:
-            assert level['md5sum'] == hashlib.md5(file.read()).hexdigest()
+        # Hash in a thread so the other downloads keep going while this one is read back in
+        assert level['md5sum'] == await asyncio.to_thread(md5_of, level_path)
 
     with TemporaryDirectory() as tempdir:
         async with httpx.AsyncClient(timeout=CLIENT_TIMEOUT) as client:
-            await asyncio.gather(*[check_level(level) for level in levels])
-            await asyncio.gather(*[check_level(level) for level in levels2])
+            for wave in (TESTING_LEVELS, TESTING_LEVELS_RENAMED):
+                checks = [asyncio.ensure_future(check_level(level)) for level in wave]
+                try:
+                    # Fail as soon as any level does, instead of waiting on the big downloads like gather would
+                    for check in asyncio.as_completed(checks):
+                        await check
+                finally:
+                    # Don't leave the rest of the downloads running once the test has failed
+                    for check in checks:
+                        check.cancel()
+                    await asyncio.gather(*checks, return_exceptions=True)
 
 
 @pytest.mark.asyncio
@@ -96,16 +80,22 @@ async def test_filenames():
     assert names == correct_names
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_all_filenames():
-    """Attempt to get the filenames of all levels on the spreadsheet."""
+    """
+    Attempt to get the filenames of all levels on the spreadsheet.
+    Urls ending in .rdzip are named without a request, so this only really checks the other links.
+    """
 
-    async with httpx.AsyncClient(timeout=CLIENT_TIMEOUT) as client:
+    limits = httpx.Limits(max_connections=FILENAME_CONCURRENCY, max_keepalive_connections=FILENAME_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=CLIENT_TIMEOUT, limits=limits) as client:
         async def test(url: str) -> str:
             return await pyvitals.async_get_filename_from_url(client, url)
 
-        urls = [x.download_url for x in await pyvitals.async_get_sheet_data(client)]
-        await gather_with_concurrency(77, *[test(url) for url in urls])
+        # Some levels share a download url, no need to look those up more than once
+        urls = list(dict.fromkeys(x.download_url for x in await pyvitals.async_get_sheet_data(client)))
+        await gather_with_concurrency(FILENAME_CONCURRENCY, *[test(url) for url in urls])
 
 
 @pytest.mark.asyncio
@@ -130,3 +120,151 @@ async def test_setlist():
     setlists_len = [len(x) for x in setlists.values()]
 
     assert setlists_len[:9] == [38] * 9
+
+
+@pytest.mark.asyncio
+async def test_cache():
+    """Repeated calls with the same client reuse the response, unless they ask for a fresh pull."""
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=b'{"Setlist": [null, "url", null]}')
+
+    pyvitals.clear_cache()
+    try:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            assert await pyvitals.async_get_setlists_url(client, trim_none=True) == {"Setlist": ["url"]}
+            await pyvitals.async_get_setlists_url(client)
+            assert len(requests) == 1
+
+            await pyvitals.async_get_setlists_url(client, use_cache=False)
+            assert len(requests) == 2
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as other_client:
+            await pyvitals.async_get_setlists_url(other_client)
+            assert len(requests) == 3
+    finally:
+        pyvitals.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_download_levels_unique_names():
+    """Downloading the same url many times at once should give every copy its own name."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b'level')
+
+    count = 6
+    with TemporaryDirectory() as tempdir:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            paths = await pyvitals.async_download_levels(client, ['https://example.com/x.rdzip'] * count, tempdir)
+
+        expected = ['x.rdzip'] + [f'x ({i}).rdzip' for i in range(2, count + 1)]
+        assert sorted(path.name for path in paths) == sorted(expected)
+        assert sorted(os.listdir(tempdir)) == sorted(expected)
+
+
+@pytest.mark.asyncio
+async def test_download_levels_failure():
+    """Once one download fails, the others are cancelled instead of being left running."""
+
+    finished = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/missing.rdzip':
+            return httpx.Response(404)
+
+        await asyncio.sleep(0.2)
+        finished.append(request.url)
+        return httpx.Response(200, content=b'level')
+
+    urls = [f'https://example.com/{i}.rdzip' for i in range(3)] + ['https://example.com/missing.rdzip']
+    with TemporaryDirectory() as tempdir:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await pyvitals.async_download_levels(client, urls, tempdir)
+
+        # Give anything that was left running the chance to finish
+        await asyncio.sleep(0.4)
+
+        assert finished == []
+        assert os.listdir(tempdir) == []
+
+
+def rdzip_bytes(level_id: int) -> bytes:
+    """An in memory .rdzip, with a level by among drip so that it isn't validated and can be told apart by its id."""
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip:
+        level = '{"settings": {"author": "among drip"}, "rows": [], "events": [], "id": %d}' % level_id
+        zip.writestr('main.rdlevel', level)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_parse_urls():
+    """Parses levels from many urls at once, keeping them in the same order as the urls."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=rdzip_bytes(int(request.url.path.strip('/'))))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        levels = await pyvitals.async_parse_urls(client, [f'https://example.com/{i}' for i in range(5)])
+
+    assert [level['id'] for level in levels] == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_parse_urls_failure():
+    """Once one url fails, the other downloads are cancelled instead of being left running."""
+
+    finished = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/missing':
+            return httpx.Response(404)
+
+        await asyncio.sleep(0.2)
+        finished.append(request.url)
+        return httpx.Response(200, content=rdzip_bytes(0))
+
+    urls = [f'https://example.com/{i}' for i in range(3)] + ['https://example.com/missing']
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await pyvitals.async_parse_urls(client, urls)
+
+    # Give anything that was left running the chance to finish
+    await asyncio.sleep(0.4)
+
+    assert finished == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('head_status, head_disposition, expected_methods', FILENAME_FALLBACK_CASES)
+async def test_filename_fallback(head_status: int, head_disposition: bool, expected_methods: list[str]):
+    """Falls back to a GET request only when the HEAD request doesn't give us a filename."""
+
+    methods = []
+    handler = filename_handler(head_status, head_disposition, methods)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await pyvitals.async_get_filename_from_url(client, 'https://example.com/download?id=1') == 'level.rdzip'
+
+    assert methods == expected_methods
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('http2', [True, False])
+async def test_make_client(http2: bool):
+    """http2, the limits, and retries have to end up on the transport's connection pool, or they're ignored."""
+
+    async with pyvitals.async_make_client(http2=http2, max_connections=7, max_keepalive_connections=3,
+                                          retries=2) as client:
+        pool = client._transport._pool
+
+        assert pool._http2 is http2
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._retries == 2
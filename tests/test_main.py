@@ -1,48 +1,40 @@
-import hashlib
+import codecs
+import io
+import os
+import threading
+import time
+import warnings
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import Iterator
 
 import httpx
+import pydantic
+import pytest
 import pyvitals
+from helpers import FILENAME_FALLBACK_CASES, TESTING_LEVELS, TESTING_LEVELS_RENAMED, filename_handler, md5_of
 
 CLIENT_TIMEOUT = None
+# How many threads look up filenames at once, past ~30 this stops getting any faster
+FILENAME_WORKERS = int(os.environ.get('PYVITALS_TEST_WORKERS', 24))
 
-TESTING_LEVELS = [
-    {
-        "url": "https://cdn.discordapp.com/attachments/611380148431749151/624806831050457099/Bill_Wurtz_-_Chips.rdzip",  # noqa:E501
-        "name": "Bill_Wurtz_-_Chips.rdzip",
-        "size": 314311,
-        "md5sum": "83d6224500de3e43535c4eca87afb2df"
-    },
-    {
-        "url": "https://cdn.discordapp.com/attachments/611380148431749151/624806831050457099/Bill_Wurtz_-_Chips.rdzip",  # noqa:E501
-        "name": "Bill_Wurtz_-_Chips (2).rdzip",
-        "size": 314311,
-        "md5sum": "83d6224500de3e43535c4eca87afb2df"
-    },
-    {
-        "url": "https://www.dropbox.com/s/ppomi3tg6ovgkuo?dl=1",
-        "name": "9999_1 - 23.exe - YY.rdzip",
-        "size": 95249907,
-        "md5sum": "89ba382901a96287a7e9653a13b2661c"
-    },
-    {
-        "url": "https://drive.google.com/uc?export=download&id=1LZ5KWG4KCL1Or-kSYimbVaSFIoTrGgsI",
-        "name": "Lemon Demon - Angry People.rdzip",
-        "size": 22337449,
-        "md5sum": "188e43b30feb9bcb0848e422843ff894"
-    },
-    {
-        "url": "https://cdn.discordapp.com/attachments/611380148431749151/738933182044438639/The_Lick_in_all_12_keys.rdzip",  # noqa:E501
-        "name": "The_Lick_in_all_12_keys.rdzip",
-        "size": 725621,
-        "md5sum": "314423b4408319d366b3d0c24606ea87"
-    },
-]
-
-
-def test_filenames():
+
+@pytest.fixture(scope='module')
+def client():
+    """
+    One client for the whole module, so connections are reused between tests instead of reopened for each.
+    HTTP/2 lets the threads in test_all_filenames share a connection per host instead of each opening their own.
+    """
+
+    limits = httpx.Limits(max_connections=128, max_keepalive_connections=64, keepalive_expiry=60)
+    with httpx.Client(http2=True, timeout=CLIENT_TIMEOUT, limits=limits) as client:
+        yield client
+
+
+def test_filenames(client: httpx.Client):
     """Tests discord, google drive, and dropbox urls"""
 
     urls = [
@@ -58,22 +50,26 @@ def test_filenames():
         "MATTHEWGU4_-_Hail_Satan_Metal_Cover.rdzip",
     ]
 
-    with httpx.Client(timeout=CLIENT_TIMEOUT) as client:
-        names = [pyvitals.get_filename_from_url(client, url) for url in urls]
+    names = [pyvitals.get_filename_from_url(client, url) for url in urls]
 
     assert names == CORRECT_NAMES
 
 
-def test_download_unzip():
-    with httpx.Client(timeout=CLIENT_TIMEOUT) as client, TemporaryDirectory() as tempdir:
+@pytest.mark.slow
+def test_download_unzip(client: httpx.Client):
+    with TemporaryDirectory() as tempdir:
         for x in TESTING_LEVELS:
             pyvitals.download_unzip(client, x['url'], tempdir)
 
 
-def test_all_filenames():
-    """Attempt to get the filenames of all levels on the spreadsheet."""
+@pytest.mark.slow
+def test_all_filenames(client: httpx.Client):
+    """
+    Attempt to get the filenames of all levels on the spreadsheet.
+    Urls ending in .rdzip are named without a request, so this only really checks the other links.
+    """
 
-    with httpx.Client(timeout=CLIENT_TIMEOUT) as client, ThreadPool(40) as pool:
+    with ThreadPool(FILENAME_WORKERS) as pool:
         def test(url: str) -> None:
             try:
                 pyvitals.get_filename_from_url(client, url)
@@ -81,70 +77,96 @@ def test_all_filenames():
                 print(url)
                 raise e
 
-        urls = [x.download_url for x in pyvitals.get_sheet_data(client)]
-        results = pool.imap_unordered(test, urls)
+        # Some levels share a download url, no need to look those up more than once
+        urls = list(dict.fromkeys(x.download_url for x in pyvitals.get_sheet_data(client)))
+        results = pool.imap_unordered(test, urls, chunksize=8)
 
         for _ in results:
             pass
 
 
-def test_sheet():
+def test_sheet(client: httpx.Client):
     """Basic sanity checks for site data."""
 
-    with httpx.Client(timeout=CLIENT_TIMEOUT) as client:
-        all = pyvitals.get_sheet_data(client, verified_only=False)
-        verified = pyvitals.get_sheet_data(client, verified_only=True)
+    all = pyvitals.get_sheet_data(client, verified_only=False)
+    verified = pyvitals.get_sheet_data(client, verified_only=True)
 
     assert len(all) > len(verified)
     assert len(all) > 2000
     assert len(verified) > 1000
 
 
-def test_setlist():
+def test_setlist(client: httpx.Client):
     """Basic sanity check for setlist data."""
 
-    with httpx.Client(timeout=CLIENT_TIMEOUT) as client:
-        setlists = pyvitals.get_setlists_url(client, keep_none=False, trim_none=False)
+    setlists = pyvitals.get_setlists_url(client, keep_none=False, trim_none=False)
     setlists_len = [len(x) for x in setlists.values()]
 
     assert setlists_len[:9] == [38] * 9
 
 
-def test_download_levels():
+@pytest.mark.slow
+def test_download_levels(client: httpx.Client):
     """Check the filename, filesize, and hash of a few preset levels"""
 
-    with httpx.Client(timeout=CLIENT_TIMEOUT) as client, TemporaryDirectory() as tempdir:
-        for level in TESTING_LEVELS:
-            level_path = pyvitals.download_level(client, level['url'], tempdir)
+    def check_level(level: dict) -> None:
+        level_path = pyvitals.download_level(client, level['url'], tempdir)
+
+        assert level['name'] == level_path.name
+        assert level['size'] == level_path.stat().st_size
+        assert level['md5sum'] == md5_of(level_path)
+
+    with TemporaryDirectory() as tempdir, ThreadPoolExecutor(max_workers=len(TESTING_LEVELS)) as executor:
+        for wave in (TESTING_LEVELS, TESTING_LEVELS_RENAMED):
+            list(executor.map(check_level, wave))
+
+
+def iter_level_paths(root: str) -> Iterator[str]:
+    """Yields the .rdlevel files one folder deep in root, like glob('*/*.rdlevel') but streamed from os.scandir."""
+
+    if not os.path.isdir(root):
+        return
 
-            assert level['name'] == level_path.name
-            assert level['size'] == level_path.stat().st_size
-            with level_path.open('rb') as file:
-                assert level['md5sum'] == hashlib.md5(file.read()).hexdigest()
+    with os.scandir(root) as folders:
+        for folder in folders:
+            if not folder.is_dir():
+                continue
 
+            with os.scandir(folder.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.rdlevel'):
+                        yield entry.path
 
+
+def parse_level_file(level_path: str) -> None:
+    try:
+        with open(level_path, 'r', encoding='utf-8-sig') as file:
+            pyvitals.parse_level(file)
+
+    except Exception as e:
+        print(level_path)
+        raise e
+
+
+@pytest.mark.slow
 def test_parse_all_levels():
     """Attempts to parse all my downloaded levels to see if there are any errors."""
 
     # Change this to your levels folder.
-    levels = Path('/home/huantian/Documents/Rhythm Doctor/Levels').glob('*/*.rdlevel')
-
-    for level_path in levels:
-        try:
-            with open(level_path, 'r', encoding='utf-8-sig') as file:
-                pyvitals.parse_level(file)
+    levels = iter_level_paths('/home/huantian/Documents/Rhythm Doctor/Levels')
 
-        except Exception as e:
-            print(level_path)
-            raise e
+    # Parsing is cpu bound, so spread the levels over all the cores
+    with ProcessPoolExecutor() as executor:
+        for _ in executor.map(parse_level_file, levels, chunksize=16):
+            pass
 
 
-def test_parse_urls():
+@pytest.mark.slow
+def test_parse_urls(client: httpx.Client):
     """Attempts to parse a few levels from urls"""
 
-    with httpx.Client(timeout=CLIENT_TIMEOUT) as client:
-        for level in TESTING_LEVELS:
-            pyvitals.parse_url(client, level['url'])
+    for level in TESTING_LEVELS:
+        pyvitals.parse_url(client, level['url'])
 
 
 def test_rename():
@@ -171,3 +193,405 @@ def test_rename():
         renamed.mkdir()
         renamed = pyvitals.rename(file)
         assert renamed == file.with_stem("test (5)")
+
+
+# Just enough settings for a level to validate, every test level adds its own description
+LEVEL_SETTINGS = """
+    "version": 45, "artist": "Bill", "song": "Chips", "author": "someone", "difficulty": "Medium",
+    "previewImage": "preview.png", "syringeIcon": "icon.png", "previewSong": "song.ogg",
+    "previewSongStartTime": 0, "previewSongDuration": 10, "songNameHue": 0, "tags": "a, b",
+    "separate2PLevelFilename": "", "canBePlayedOn": "OnePlayerOnly", "firstBeatBehavior": "RunEventsOnPreBar",
+    "multiplayerAppearance": "HorizontalStrips", "rankMaxMistakes": [20, 15, 10, 5],
+    "rankDescription": ["a", "b", "c", "d", "e", "f"]
+"""
+
+
+@pytest.fixture
+def rapidjson_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Records the text of every level that had to fall back to rapidjson."""
+
+    import rapidjson
+
+    calls = []
+    loads = rapidjson.loads
+
+    def recording_loads(text: str, *args, **kwargs):
+        calls.append(text)
+        return loads(text, *args, **kwargs)
+
+    monkeypatch.setattr(rapidjson, 'loads', recording_loads)
+    return calls
+
+
+def test_parse_level_valid_json(rapidjson_calls: list[str]):
+    """Valid levels are parsed by orjson as they are, without the fixups touching them."""
+
+    # The description looks like one of the missing commas, the fixups would add a comma to it
+    text = '{"settings": {%s, "description": "a\\": 5 \\"b"}, "rows": [], "events": []}' % LEVEL_SETTINGS
+
+    level = pyvitals.parse_level(text)
+
+    assert level.settings.description == 'a": 5 "b'
+    assert rapidjson_calls == []
+
+
+def test_parse_level_trailing_commas(rapidjson_calls: list[str]):
+    """Trailing commas fall back to rapidjson, still without needing the fixups."""
+
+    text = '{"settings": {%s, "description": "desc",}, "rows": [{"row": 0},], "events": [],}' % LEVEL_SETTINGS
+
+    level = pyvitals.parse_level(text)
+
+    assert level.rows == [{"row": 0}]
+    assert rapidjson_calls == [text]
+
+
+def test_parse_level_fixups(rapidjson_calls: list[str]):
+    """Missing commas and raw newlines in strings get fixed up before parsing again."""
+
+    text = ('{"settings": {%s, "description": "line one\nline two"}, "rows": [], '
+            '"events": [{"bar": 1, "volume": 100 "pitch": 100}]}' % LEVEL_SETTINGS)
+
+    level = pyvitals.parse_level(text)
+
+    assert level.settings.description == "line oneline two"
+    assert level.events == [{"bar": 1, "volume": 100, "pitch": 100}]
+    # rapidjson only sees the broken level, the fixed up one is valid json again so orjson handles it
+    assert rapidjson_calls == [text]
+
+
+def test_parse_level_among_drip():
+    """Levels by among drip are passed through as plain dicts instead of being validated."""
+
+    text = '{"settings": {"author": "among drip"}, "rows": [], "events": []}'
+
+    assert pyvitals.parse_level(io.StringIO(text)) == {"settings": {"author": "among drip"}, "rows": [], "events": []}
+
+
+def test_download_levels_unique_names(monkeypatch: pytest.MonkeyPatch):
+    """Downloading the same url many times at once should give every copy its own name."""
+
+    count = 6
+    # Hold every response back until all the downloads are waiting, so that they all race to claim a name
+    barrier = threading.Barrier(count)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        barrier.wait()
+        return httpx.Response(200, content=b'level')
+
+    rename = pyvitals._shared.rename
+
+    def slow_rename(path: Path) -> Path:
+        # Give the other downloads time to pick the same name before this one claims it
+        candidate = rename(path)
+        time.sleep(0.05)
+        return candidate
+
+    monkeypatch.setattr(pyvitals._shared, 'rename', slow_rename)
+
+    with TemporaryDirectory() as tempdir, httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        paths = pyvitals.download_levels(client, ['https://example.com/x.rdzip'] * count, tempdir, max_workers=count)
+
+        expected = ['x.rdzip'] + [f'x ({i}).rdzip' for i in range(2, count + 1)]
+        assert sorted(path.name for path in paths) == sorted(expected)
+        assert sorted(os.listdir(tempdir)) == sorted(path.name for path in paths)
+
+
+def read_tree(root: str) -> dict[str, bytes]:
+    """Maps the path of every file under root, relative to root, to its contents."""
+
+    return {
+        os.path.relpath(os.path.join(folder, name), root): Path(folder, name).read_bytes()
+        for folder, _, names in os.walk(root) for name in names
+    }
+
+
+@pytest.mark.parametrize('entries', [4, 24])
+def test_unzip_level(monkeypatch: pytest.MonkeyPatch, entries: int):
+    """Unzipping should give the same files as extractall, whether the rdzip is extracted on one thread or many."""
+
+    # Small rdzips are extracted serially, bigger ones are spread over multiple threads, even on a single core machine
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+
+    with TemporaryDirectory() as tempdir:
+        zip_path = Path(tempdir, 'level.rdzip')
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip:
+            zip.writestr('main.rdlevel', '{}')
+            for i in range(entries - 1):
+                # Every worker ends up with files in the same few folders
+                zip.writestr(f'assets/{i % 3}/sound {i}.ogg', os.urandom(1024) * (i + 1))
+
+        expected = Path(tempdir, 'expected')
+        with zipfile.ZipFile(zip_path) as zip:
+            zip.extractall(expected)
+
+        makedirs = os.makedirs
+        created = set()
+
+        def racing_makedirs(name, *args, **kwargs):
+            # Pretend another worker made the folder between zipfile checking for it and making it
+            makedirs(name, *args, **kwargs)
+            if name not in created:
+                created.add(name)
+                raise FileExistsError(name)
+
+        output = Path(tempdir, 'output')
+        with monkeypatch.context() as patch:
+            if entries > 8:
+                patch.setattr(os, 'makedirs', racing_makedirs)
+            pyvitals.unzip_level(zip_path, output)
+
+        assert read_tree(output) == read_tree(expected)
+
+
+@pytest.fixture
+def counting_client() -> Iterator[tuple[httpx.Client, list[httpx.Request]]]:
+    """A client that answers the sheet and setlists endpoints offline, along with every request it has sent."""
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.params.get('keepNull') is not None:
+            return httpx.Response(200, content=b'{"Setlist": [null, "url", null]}')
+        return httpx.Response(200, content=b'[]')
+
+    pyvitals.clear_cache()
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        yield client, requests
+    pyvitals.clear_cache()
+
+
+def test_cache_hit(counting_client: tuple[httpx.Client, list[httpx.Request]]):
+    """Repeated calls reuse the response, unless they ask for different data, a fresh pull, or use another client."""
+
+    client, requests = counting_client
+
+    assert pyvitals.get_setlists_url(client, keep_none=True) == {"Setlist": [None, "url", None]}
+    assert pyvitals.get_setlists_url(client, keep_none=True, trim_none=True) == {"Setlist": ["url"]}
+    assert len(requests) == 1
+
+    pyvitals.get_setlists_url(client, keep_none=False)
+    assert len(requests) == 2
+
+    pyvitals.get_sheet_data(client)
+    pyvitals.get_sheet_data(client, verified_only=True)
+    assert len(requests) == 3
+
+    pyvitals.get_sheet_data(client, use_cache=False)
+    assert len(requests) == 4
+
+    def other_handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b'{"Other": []}')
+
+    with httpx.Client(transport=httpx.MockTransport(other_handler)) as other_client:
+        assert pyvitals.get_setlists_url(other_client, keep_none=True) == {"Other": []}
+
+
+def test_cache_expiry(counting_client: tuple[httpx.Client, list[httpx.Request]], monkeypatch: pytest.MonkeyPatch):
+    """Responses are only reused for 5 minutes."""
+
+    client, requests = counting_client
+    now = 1000.0
+    monkeypatch.setattr(time, 'monotonic', lambda: now)
+
+    pyvitals.get_sheet_data(client)
+    now += 5 * 60
+    pyvitals.get_sheet_data(client)
+    assert len(requests) == 1
+
+    now += 1
+    pyvitals.get_sheet_data(client)
+    assert len(requests) == 2
+
+
+def test_clear_cache(counting_client: tuple[httpx.Client, list[httpx.Request]]):
+    """clear_cache() makes the next call fetch fresh data."""
+
+    client, requests = counting_client
+
+    pyvitals.get_sheet_data(client)
+    pyvitals.get_setlists_url(client)
+    pyvitals.clear_cache()
+    pyvitals.get_sheet_data(client)
+    pyvitals.get_setlists_url(client)
+
+    assert len(requests) == 4
+
+
+def level_text(description: str) -> str:
+    """A small valid level, told apart from the others by its description."""
+
+    return '{"settings": {%s, "description": "%s"}, "rows": [], "events": []}' % (LEVEL_SETTINGS, description)
+
+
+def test_parse_levels():
+    """Parses .rdlevel files on multiple processes, handling BOMs and levels that need fixing up."""
+
+    with TemporaryDirectory() as tempdir:
+        paths = [Path(tempdir, f'{i}.rdlevel') for i in range(6)]
+        for i, path in enumerate(paths):
+            text = level_text(f'level {i}')
+            if i % 3 == 1:
+                # Missing comma, the fixups have to deal with this one
+                text = text.replace('"rows": [], "events": [', '"rows": [], "events": [{"volume": 100 "pitch": 100}')
+            path.write_bytes((codecs.BOM_UTF8 if i % 3 == 2 else b'') + text.encode('utf-8'))
+
+        levels = pyvitals.parse_levels(paths, max_workers=2)
+
+    assert [level.settings.description for level in levels] == [f'level {i}' for i in range(6)]
+    assert levels[1].events == [{"volume": 100, "pitch": 100}]
+
+
+def test_parse_levels_empty_file():
+    """An empty .rdlevel isn't a level, it raises the json error from rapidjson."""
+
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir, 'empty.rdlevel')
+        path.touch()
+
+        with pytest.raises(ValueError):
+            pyvitals.parse_levels([path], max_workers=1)
+
+
+def write_rdzip(path: Path, levels: dict[str, str]) -> None:
+    """Writes an .rdzip with the given .rdlevels, saved with a BOM like the game does, and an asset."""
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip:
+        for name, text in levels.items():
+            zip.writestr(name, codecs.BOM_UTF8 + text.encode('utf-8'))
+        zip.writestr('song.ogg', b'not really a song')
+
+
+def test_parse_rdzip_all():
+    """Parses every .rdlevel in an .rdzip, keyed by name."""
+
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir, 'level.rdzip')
+        write_rdzip(path, {'main.rdlevel': level_text('main'), 'main 2P.rdlevel': level_text('two player')})
+
+        levels = pyvitals.parse_rdzip_all(path)
+
+    assert {name: level.settings.description for name, level in levels.items()} == {
+        'main.rdlevel': 'main',
+        'main 2P.rdlevel': 'two player',
+    }
+
+
+def test_parse_rdzips():
+    """Parses .rdzip files on multiple processes, keeping them in the same order as the paths."""
+
+    with TemporaryDirectory() as tempdir:
+        paths = [Path(tempdir, f'{i}.rdzip') for i in range(6)]
+        for i, path in enumerate(paths):
+            write_rdzip(path, {'main.rdlevel': level_text(f'level {i}')})
+
+        levels = pyvitals.parse_rdzips(paths, max_workers=2)
+
+    assert [level.settings.description for level in levels] == [f'level {i}' for i in range(6)]
+
+
+def test_parse_rdzip_no_main_level():
+    """An .rdzip without a main.rdlevel raises BadRDZipFile, naming the file if there is one."""
+
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir, 'level.rdzip')
+        write_rdzip(path, {'other.rdlevel': level_text('other')})
+
+        with pytest.raises(pyvitals.BadRDZipFile, match="level.rdzip doesn't contain a main.rdlevel."):
+            pyvitals.parse_rdzip(path)
+
+        with pytest.raises(pyvitals.BadRDZipFile, match="^The rdzip doesn't contain a main.rdlevel.$"):
+            pyvitals.parse_rdzip(io.BytesIO(path.read_bytes()))
+
+
+def test_lazy_classes():
+    """The models are loaded lazily, but are still listed and star-importable like everything else."""
+
+    assert {'Difficulty', 'PartialSettings', 'LevelSettings', 'SiteMetadata'} <= set(dir(pyvitals))
+
+    namespace = {}
+    exec('from pyvitals import *', namespace)
+    assert namespace['SiteMetadata'] is pyvitals.classes.SiteMetadata
+    assert namespace['parse_level'] is pyvitals.parse_level
+
+
+def test_parse_rdzip_seperate_2p():
+    """parse_seperate_2p parses the 2P level the main level points to, raising No2PLevel when it isn't there."""
+
+    main_level = level_text('main').replace('"separate2PLevelFilename": ""',
+                                            '"separate2PLevelFilename": "main 2P.rdlevel"')
+
+    with TemporaryDirectory() as tempdir:
+        path = Path(tempdir, 'level.rdzip')
+        write_rdzip(path, {'main.rdlevel': main_level, 'main 2P.rdlevel': level_text('two player')})
+
+        assert pyvitals.parse_rdzip(path).settings.description == 'main'
+        assert pyvitals.parse_rdzip(path, parse_seperate_2p=True).settings.description == 'two player'
+
+        missing_path = Path(tempdir, 'missing.rdzip')
+        write_rdzip(missing_path, {'main.rdlevel': main_level})
+
+        with pytest.raises(pyvitals.No2PLevel):
+            pyvitals.parse_rdzip(missing_path, parse_seperate_2p=True)
+
+
+@pytest.mark.parametrize('head_status, head_disposition, expected_methods', FILENAME_FALLBACK_CASES)
+def test_filename_fallback(head_status: int, head_disposition: bool, expected_methods: list[str]):
+    """Falls back to a GET request only when the HEAD request doesn't give us a filename."""
+
+    methods = []
+    handler = filename_handler(head_status, head_disposition, methods)
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        assert pyvitals.get_filename_from_url(client, 'https://example.com/download?id=1') == 'level.rdzip'
+
+    assert methods == expected_methods
+
+
+@pytest.mark.parametrize('http2', [True, False])
+def test_make_client(http2: bool):
+    """http2, the limits, and retries have to end up on the transport's connection pool, or they're ignored."""
+
+    with pyvitals.make_client(http2=http2, max_connections=7, max_keepalive_connections=3,
+                              retries=2) as client:
+        pool = client._transport._pool
+
+        assert pool._http2 is http2
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._retries == 2
+
+
+# A level as it comes from the sheet, with a url that pydantic would normalise
+SITE_METADATA = {
+    "song": "Chips", "artist": "Bill Wurtz", "author": "someone", "description": "desc", "difficulty": "Medium",
+    "seizure_warning": False, "tags": ["a", "b"], "download_url": "https://Example.com/Chips%20Level.rdzip?dl=1",
+    "preview_img": "", "last_updated": "2021-01-01T00:00:00Z", "max_bpm": 100, "min_bpm": 100,
+    "single_player": True, "two_player": False, "verified": True,
+}
+
+
+def test_site_metadata_urls():
+    """Urls are validated, but kept exactly as the sheet has them."""
+
+    level = pyvitals.SiteMetadata(**SITE_METADATA)
+
+    assert level.download_url == "https://Example.com/Chips%20Level.rdzip?dl=1"
+    assert level.preview_img is None
+
+    with pytest.raises(pydantic.ValidationError):
+        pyvitals.SiteMetadata(**{**SITE_METADATA, "download_url": "not a url"})
+
+
+def test_site_metadata_from_trusted():
+    """Dumping a SiteMetadata and rebuilding it with from_trusted gives back the same level, without any warnings."""
+
+    level = pyvitals.SiteMetadata(**SITE_METADATA)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        rebuilt = pyvitals.SiteMetadata.from_trusted(level.model_dump())
+
+    assert rebuilt == level
+    assert rebuilt.download_url == SITE_METADATA["download_url"]